@@ -0,0 +1,88 @@
+from utils.db_connection import execute_query_json
+from utils.cambios_utils import CambiosUtils
+import logging
+import json
+import time
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# El long-polling se despierta con el evento en proceso al confirmar cada
+# lote. Este sondeo solo cubre escrituras de otros procesos; es largo a
+# propósito porque pyodbc bloquea el event loop durante cada consulta.
+INTERVALO_SONDEO = 10.0
+
+
+class CambiosController:
+
+    @staticmethod
+    async def get_cambios(since: int, limit: int, timeout: float) -> Dict[str, Any]:
+        try:
+            logger.info(f"📰 GET: Cambios desde seq={since} (limit={limit}, timeout={timeout}s)")
+
+            limite_espera = time.monotonic() + timeout
+            primera = True
+
+            while True:
+                cambios = await CambiosController._leer_cambios(since, limit)
+
+                # Solo puede faltar algo si hay un hueco después de since
+                # (o, en la primera lectura, si no quedó nada). La consulta
+                # del estado va después de leer: si una purga corrió entre
+                # medio, el consumidor igual se entera.
+                hueco = cambios[0]["seq"] > since + 1 if cambios else primera
+                primera = False
+                if hueco:
+                    seq_purgado = await CambiosUtils.seq_purgado()
+                    if since < seq_purgado:
+                        return {
+                            "exito": False,
+                            "codigo": 410,
+                            "mensaje": (
+                                f"El registro de cambios ya no contiene seq={since + 1}. "
+                                "Volver a sincronizar las tablas completas y continuar "
+                                f"desde since={seq_purgado}"
+                            ),
+                            "datos": {"seq_purgado": seq_purgado}
+                        }
+
+                restante = limite_espera - time.monotonic()
+                if cambios or restante <= 0:
+                    break
+
+                await CambiosUtils.esperar(min(restante, INTERVALO_SONDEO))
+
+            ultimo_seq = cambios[-1]["seq"] if cambios else since
+
+            return {
+                "exito": True,
+                "codigo": 200,
+                "mensaje": f"{len(cambios)} cambios encontrados",
+                "datos": {
+                    "cambios": cambios,
+                    "ultimo_seq": ultimo_seq,
+                    "hay_mas": len(cambios) == limit
+                }
+            }
+        except Exception as e:
+            logger.error(f"❌ Error: {str(e)}")
+            return {
+                "exito": False,
+                "codigo": 500,
+                "mensaje": f"Error: {str(e)}"
+            }
+
+    @staticmethod
+    async def _leer_cambios(since: int, limit: int):
+        query = """
+            SELECT TOP (?) seq, tabla, registro_id, operacion, datos, fecha_cambio
+            FROM CambiosReplica
+            WHERE seq > ?
+            ORDER BY seq
+        """
+        resultado_json = await execute_query_json(query, (limit, since))
+        cambios = json.loads(resultado_json)
+        for cambio in cambios:
+            cambio["seq"] = int(cambio["seq"])
+            cambio["datos"] = json.loads(cambio["datos"]) if cambio.get("datos") else None
+        return cambios
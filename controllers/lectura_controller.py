@@ -1,8 +1,10 @@
 from utils.db_connection import execute_query_json
+from utils.filtros_utils import FiltrosUtils, FiltroInvalido, COLUMNA_FECHA
 from models import DepartamentoResponse, MedicoResponse, ConsultaResponse
 import logging
 import json
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -10,79 +12,102 @@ logger = logging.getLogger(__name__)
 class LecturaController:
 
     @staticmethod
-    async def get_departamentos() -> Dict[str, Any]:
-        try:
-            logger.info("📋 GET: Obteniendo departamentos de BD2")
-
-            query = "SELECT * FROM Departamentos ORDER BY id"
-            resultado_json = await execute_query_json(query)
-            resultados = json.loads(resultado_json)
+    async def get_departamentos(
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        logger.info("📋 GET: Obteniendo departamentos de BD2")
+        return await LecturaController._leer(
+            'departamentos', DepartamentoResponse, "departamentos encontrados",
+            igualdad={},
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            fields=fields
+        )
 
-            # Validar con Pydantic
-            departamentos_validados = [
-                DepartamentoResponse(**dept) for dept in resultados
-            ]
+    @staticmethod
+    async def get_medicos(
+        departamento_id: Optional[int] = None,
+        especialidad: Optional[str] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        logger.info("📋 GET: Obteniendo médicos de BD2")
+        return await LecturaController._leer(
+            'medicos', MedicoResponse, "médicos encontrados",
+            igualdad={
+                'departamento_id': departamento_id,
+                'especialidad': especialidad
+            },
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            fields=fields
+        )
 
-            return {
-                "exito": True,
-                "codigo": 200,
-                "mensaje": f"{len(resultados)} departamentos encontrados",
-                "datos": [dept.dict() for dept in departamentos_validados]
-            }
-        except Exception as e:
-            logger.error(f"❌ Error: {str(e)}")
-            return {
-                "exito": False,
-                "codigo": 500,
-                "mensaje": f"Error: {str(e)}"
-            }
+    @staticmethod
+    async def get_consultas(
+        medico_id: Optional[int] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        logger.info("📋 GET: Obteniendo consultas de BD2")
+        return await LecturaController._leer(
+            'consultas', ConsultaResponse, "consultas encontradas",
+            igualdad={'medico_id': medico_id},
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            fields=fields
+        )
 
     @staticmethod
-    async def get_medicos() -> Dict[str, Any]:
+    async def _leer(
+        table: str,
+        modelo,
+        sufijo_mensaje: str,
+        igualdad: Dict[str, Any],
+        fecha_desde: Optional[str],
+        fecha_hasta: Optional[str],
+        fields: Optional[str]
+    ) -> Dict[str, Any]:
         try:
-            logger.info("📋 GET: Obteniendo médicos de BD2")
-
-            query = "SELECT * FROM Medicos ORDER BY id"
-            resultado_json = await execute_query_json(query)
-            resultados = json.loads(resultado_json)
-
-            # Validar con Pydantic
-            medicos_validados = [
-                MedicoResponse(**med) for med in resultados
-            ]
-
-            return {
-                "exito": True,
-                "codigo": 200,
-                "mensaje": f"{len(resultados)} médicos encontrados",
-                "datos": [med.dict() for med in medicos_validados]
-            }
-        except Exception as e:
-            logger.error(f"❌ Error: {str(e)}")
+            query, params, proyeccion = FiltrosUtils.build_select(
+                table,
+                fields=fields,
+                igualdad=igualdad,
+                fecha_desde=fecha_desde,
+                fecha_hasta=fecha_hasta
+            )
+        except FiltroInvalido as e:
             return {
                 "exito": False,
-                "codigo": 500,
-                "mensaje": f"Error: {str(e)}"
+                "codigo": 400,
+                "mensaje": str(e)
             }
 
-    @staticmethod
-    async def get_consultas() -> Dict[str, Any]:
         try:
-            logger.info("📋 GET: Obteniendo consultas de BD2")
-
-            query = "SELECT * FROM Consultas ORDER BY id"
-            resultado_json = await execute_query_json(query)
+            resultado_json = await execute_query_json(query, params)
             resultados = json.loads(resultado_json)
 
-            consultas_validadas = [
-                ConsultaResponse(**cons) for cons in resultados
-            ]
+            if proyeccion:
+                # Con proyección no hay registros completos que validar, pero
+                # la fecha debe salir igual que con el modelo (ISO 8601)
+                columna_fecha = COLUMNA_FECHA[table]
+                for fila in resultados:
+                    if fila.get(columna_fecha) is not None:
+                        fila[columna_fecha] = datetime.fromisoformat(str(fila[columna_fecha]))
+                datos = resultados
+            else:
+                # Validar con Pydantic
+                datos = [modelo(**fila).dict() for fila in resultados]
 
             return {
                 "exito": True,
                 "codigo": 200,
-                "mensaje": f"{len(resultados)} consultas encontradas",
-                "datos": [cons.dict() for cons in consultas_validadas]
+                "mensaje": f"{len(resultados)} {sufijo_mensaje}",
+                "datos": datos
             }
         except Exception as e:
             logger.error(f"❌ Error: {str(e)}")
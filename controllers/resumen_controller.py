@@ -0,0 +1,67 @@
+from utils.db_connection import execute_query_json
+import logging
+import json
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResumenController:
+
+    @staticmethod
+    async def get_medicos_por_departamento(departamento_id: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            logger.info("📊 GET: Obteniendo médicos por departamento de BD2")
+
+            query = "SELECT departamento_id, total_medicos FROM ResumenMedicosDepartamento"
+            params = None
+            if departamento_id is not None:
+                query += " WHERE departamento_id = ?"
+                params = (departamento_id,)
+            query += " ORDER BY departamento_id"
+
+            resultado_json = await execute_query_json(query, params)
+            resultados = json.loads(resultado_json)
+
+            return {
+                "exito": True,
+                "codigo": 200,
+                "mensaje": f"{len(resultados)} departamentos con médicos",
+                "datos": resultados
+            }
+        except Exception as e:
+            logger.error(f"❌ Error: {str(e)}")
+            return {
+                "exito": False,
+                "codigo": 500,
+                "mensaje": f"Error: {str(e)}"
+            }
+
+    @staticmethod
+    async def get_consultas_por_medico(medico_id: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            logger.info("📊 GET: Obteniendo consultas por médico de BD2")
+
+            query = "SELECT medico_id, total_consultas FROM ResumenConsultasMedico"
+            params = None
+            if medico_id is not None:
+                query += " WHERE medico_id = ?"
+                params = (medico_id,)
+            query += " ORDER BY medico_id"
+
+            resultado_json = await execute_query_json(query, params)
+            resultados = json.loads(resultado_json)
+
+            return {
+                "exito": True,
+                "codigo": 200,
+                "mensaje": f"{len(resultados)} médicos con consultas",
+                "datos": resultados
+            }
+        except Exception as e:
+            logger.error(f"❌ Error: {str(e)}")
+            return {
+                "exito": False,
+                "codigo": 500,
+                "mensaje": f"Error: {str(e)}"
+            }
@@ -1,12 +1,24 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 from utils.sync_utils import SyncUtils
-from utils.db_connection import execute_query_json
+from utils.db_connection import execute_query_json, execute_transaction
+from utils.resumen_utils import ResumenUtils
+from utils.cambios_utils import CambiosUtils
+from utils.filtros_utils import COLUMNAS_TABLAS, TABLAS_SQL
+from utils.reconciliacion_utils import ReconciliacionUtils
 import json
 
 logger = logging.getLogger(__name__)
 
+# Registros nuevos que se insertan juntos en una misma transacción
+LOTE_SYNC = 100
+
+# Reconciliación: en cuántos subrangos se parte cada rango distinto y con
+# cuántas filas (como máximo) se deja de partir y se baja el rango completo
+PARTICIONES_RECONCILIACION = 16
+UMBRAL_REPARACION = 64
+
 
 class SyncController:
 
@@ -49,34 +61,49 @@ class SyncController:
 
             logger.info(f"⚙️  Procesando {recibidos} registros...")
 
+            pendientes = []
+            vistos = set()
+
             for i, registro in enumerate(registros_recibidos, 1):
                 try:
                     id_original = registro.get('id')
 
+                    # Un id repetido en la respuesta de la fuente se omite
+                    # igual que uno que ya existe en BD2
+                    if id_original in vistos:
+                        omitidos += 1
+                        continue
+                    vistos.add(id_original)
+
                     existe = await SyncUtils.check_id_exists(table, id_original)
 
                     if existe:
                         omitidos += 1
                         continue
 
-                    if table == 'departamentos':
-                        success = await SyncController._insert_departamento(registro)
-                    elif table == 'medicos':
-                        success = await SyncController._insert_medico(registro)
-                    elif table == 'consultas':
-                        success = await SyncController._insert_consulta(registro)
-                    else:
-                        success = False
-
-                    if success:
-                        insertados += 1
-                    else:
-                        errores += 1
+                    pendientes.append(registro)
 
                 except Exception as e:
                     logger.error(f"Error: {str(e)}")
                     errores += 1
 
+                if len(pendientes) >= LOTE_SYNC:
+                    ok, fallidos = await SyncController._insert_lote(table, pendientes)
+                    insertados += ok
+                    errores += fallidos
+                    pendientes = []
+
+            if pendientes:
+                ok, fallidos = await SyncController._insert_lote(table, pendientes)
+                insertados += ok
+                errores += fallidos
+
+            if insertados:
+                try:
+                    await CambiosUtils.purgar()
+                except Exception as e:
+                    logger.warning(f"⚠️ No se pudo purgar el registro de cambios: {str(e)}")
+
             logger.info("✓ Sincronización completada")
 
             return {
@@ -101,61 +128,316 @@ class SyncController:
             }
 
     @staticmethod
-    async def _insert_departamento(registro: Dict) -> bool:
+    async def reconciliar(table: str) -> Dict[str, Any]:
+        """Compara hashes por rangos de id con la API Fuente y repara solo
+        los rangos que difieren (inserta faltantes, actualiza distintos y
+        elimina los que ya no existen en la fuente)."""
         try:
-            query = """
-                INSERT INTO Departamentos (id, nombre, ubicacion, fecha_creacion)
-                VALUES (?, ?, ?, ?)
-            """
-            params = (
-                registro.get('id'),
-                registro.get('nombre'),
-                registro.get('ubicacion'),
-                registro.get('fecha_creacion')
-            )
-            await execute_query_json(query, params, needs_commit=True)
-            return True
+            logger.info(f"🔍 Iniciando reconciliación de '{table}'")
+
+            if table not in TABLAS_SQL:
+                return {
+                    "exito": False,
+                    "codigo": 400,
+                    "mensaje": f"Tabla inválida. Usar: {', '.join(TABLAS_SQL)}"
+                }
+
+            # Una sola llamada inicial: la fuente parte su propio rango de ids
+            remoto = await SyncUtils.fetch_hashes_from_source(table, PARTICIONES_RECONCILIACION)
+            if remoto is None:
+                return {
+                    "exito": False,
+                    "codigo": 500,
+                    "mensaje": "Error al conectar con API Fuente"
+                }
+
+            limites_json = await execute_query_json(
+                f"SELECT MIN(id) AS id_min, MAX(id) AS id_max FROM {TABLAS_SQL[table]}")
+            local = json.loads(limites_json)[0]
+
+            resultado = {
+                "tabla": table,
+                "rangos_comparados": 0,
+                "rangos_reparados": 0,
+                "filas_transferidas": 0,
+                "insertados": 0,
+                "actualizados": 0,
+                "eliminados": 0,
+                "hashes_recalculados": 0,
+                "errores": 0
+            }
+
+            # Filas de BD2 fuera del rango de ids de la fuente: allá no existen
+            fuera = []
+            if local.get('id_min') is not None:
+                local_min, local_max = int(local['id_min']), int(local['id_max'])
+                if remoto.get('id_min') is None:
+                    fuera.append((local_min, local_max))
+                else:
+                    fuente_min, fuente_max = int(remoto['id_min']), int(remoto['id_max'])
+                    if local_min < fuente_min:
+                        fuera.append((local_min, fuente_min - 1))
+                    if local_max > fuente_max:
+                        fuera.append((fuente_max + 1, local_max))
+
+            por_comparar = [remoto.get('rangos', [])]
+
+            while por_comparar:
+                rangos_remotos = por_comparar.pop()
+                rangos_locales = await SyncController._hashes_locales(
+                    table, [(r['id_desde'], r['id_hasta']) for r in rangos_remotos])
+
+                for r_remoto, r_local in zip(rangos_remotos, rangos_locales):
+                    resultado["rangos_comparados"] += 1
+
+                    if (r_remoto['cantidad'] == r_local['cantidad']
+                            and r_remoto['hash'] == r_local['hash']):
+                        continue
+
+                    if max(r_remoto['cantidad'], r_local['cantidad']) > UMBRAL_REPARACION:
+                        subrangos = await SyncUtils.fetch_hashes_from_source(
+                            table, PARTICIONES_RECONCILIACION,
+                            r_remoto['id_desde'], r_remoto['id_hasta'])
+                        if subrangos is None:
+                            raise Exception("Error al conectar con API Fuente")
+                        por_comparar.append(subrangos.get('rangos', []))
+                        continue
+
+                    await SyncController._reparar_rango(
+                        table, r_remoto['id_desde'], r_remoto['id_hasta'], resultado)
+
+            for id_desde, id_hasta in fuera:
+                await SyncController._reparar_rango(table, id_desde, id_hasta, resultado)
+
+            if resultado["insertados"] or resultado["actualizados"] or resultado["eliminados"]:
+                try:
+                    await CambiosUtils.purgar()
+                except Exception as e:
+                    logger.warning(f"⚠️ No se pudo purgar el registro de cambios: {str(e)}")
+
+            logger.info("✓ Reconciliación completada")
+
+            return {
+                "exito": True,
+                "codigo": 200,
+                "mensaje": f"Reconciliación de {table} completada",
+                "datos": resultado
+            }
+
         except Exception as e:
-            logger.error(f"Error: {str(e)}")
-            return False
+            logger.error(f"❌ Error: {str(e)}")
+            return {
+                "exito": False,
+                "codigo": 500,
+                "mensaje": f"Error: {str(e)}"
+            }
 
     @staticmethod
-    async def _insert_medico(registro: Dict) -> bool:
+    async def _leer_rango(table: str, id_desde: int, id_hasta: int) -> List[Dict]:
+        query = f"SELECT * FROM {TABLAS_SQL[table]} WHERE id BETWEEN ? AND ? ORDER BY id"
+        resultado_json = await execute_query_json(query, (id_desde, id_hasta))
+        return json.loads(resultado_json)
+
+    @staticmethod
+    async def _hashes_locales(table: str, rangos: List[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """Cantidad y hash de cada rango calculados en SQL Server sobre
+        hash_fila, sin traer las filas de BD2."""
+        if not rangos:
+            return []
+        query, params = ReconciliacionUtils.build_hashes_sql(table, rangos)
+        resultado_json = await execute_query_json(query, params)
+        return ReconciliacionUtils.completar_rangos(rangos, json.loads(resultado_json))
+
+    @staticmethod
+    async def _reparar_rango(table: str, id_desde: int, id_hasta: int, resultado: Dict[str, Any]) -> None:
+        """Baja un rango de la fuente y aplica las diferencias en una transacción.
+
+        Si la transacción falla se reintenta fila a fila, igual que en la
+        sincronización, para que una fila inválida no bloquee al resto.
+        """
+        fuente = await SyncUtils.fetch_rango_from_source(table, id_desde, id_hasta)
+        if fuente is None:
+            raise Exception("Error al conectar con API Fuente")
+
+        replica = await SyncController._leer_rango(table, id_desde, id_hasta)
+        faltantes, distintos, sobrantes = ReconciliacionUtils.diferencias(table, fuente, replica)
+
+        resultado["rangos_reparados"] += 1
+        resultado["filas_transferidas"] += len(fuente)
+        logger.info(
+            f"🔧 Rango {id_desde}-{id_hasta}: {len(faltantes)} faltantes, "
+            f"{len(distintos)} distintos, {len(sobrantes)} sobrantes")
+
+        # Cada operación: (contador, sentencia de datos, movimientos de resumen, entrada de cambio)
+        operaciones = []
+        for registro in faltantes:
+            operaciones.append((
+                "insertados",
+                SyncController._insert(table, registro),
+                [(registro, 1)],
+                (registro, 'insert')
+            ))
+        for registro, local in distintos:
+            hash_fuente = ReconciliacionUtils.hash_registro(table, registro)
+            if ReconciliacionUtils.hash_registro(table, local) == hash_fuente:
+                # Mismo contenido, hash_fila faltante o viejo: solo se recalcula
+                operaciones.append((
+                    "hashes_recalculados",
+                    (f"UPDATE {TABLAS_SQL[table]} SET hash_fila = ? WHERE id = ?",
+                     (hash_fuente, local.get('id'))),
+                    [],
+                    None
+                ))
+                continue
+            operaciones.append((
+                "actualizados",
+                SyncController._update(table, registro),
+                [(registro, 1), (local, -1)],
+                (registro, 'update')
+            ))
+        for local in sobrantes:
+            operaciones.append((
+                "eliminados",
+                (f"DELETE FROM {TABLAS_SQL[table]} WHERE id = ?", (local.get('id'),)),
+                [(local, -1)],
+                (local, 'delete')
+            ))
+
+        if not operaciones:
+            return
+
+        confirmados = 0
         try:
-            query = """
-                INSERT INTO Medicos (id, departamento_id, nombre, apellido, especialidad, fecha_registro)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                registro.get('id'),
-                registro.get('departamento_id'),
-                registro.get('nombre'),
-                registro.get('apellido'),
-                registro.get('especialidad'),
-                registro.get('fecha_registro')
-            )
-            await execute_query_json(query, params, needs_commit=True)
-            return True
+            await execute_transaction(SyncController._statements_reparacion(table, operaciones))
+            for tipo, _, _, _ in operaciones:
+                resultado[tipo] += 1
+            confirmados = len(operaciones)
         except Exception as e:
-            logger.error(f"Error: {str(e)}")
-            return False
+            logger.warning(f"⚠️ Reparación falló, reintentando por registro: {str(e)}")
+            for operacion in operaciones:
+                try:
+                    await execute_transaction(
+                        SyncController._statements_reparacion(table, [operacion]))
+                    resultado[operacion[0]] += 1
+                    confirmados += 1
+                except Exception as e:
+                    logger.error(f"Error: {str(e)}")
+                    resultado["errores"] += 1
+
+        if confirmados:
+            CambiosUtils.notificar()
+
+    @staticmethod
+    def _statements_reparacion(table: str, operaciones: List[Tuple]) -> List[Tuple[str, tuple]]:
+        """Mismo orden que _statements: datos, resúmenes y por último el
+        applock con el registro de cambios."""
+        statements = [datos for _, datos, _, _ in operaciones]
+        statements.extend(ResumenUtils.build_deltas(
+            table, [m for _, _, movimientos, _ in operaciones for m in movimientos]))
+        statements.extend(CambiosUtils.build_entradas(
+            table, [entrada for _, _, _, entrada in operaciones if entrada]))
+        return statements
 
     @staticmethod
-    async def _insert_consulta(registro: Dict) -> bool:
+    def _insert(table: str, registro: Dict) -> Tuple[str, tuple]:
+        builders = {
+            'departamentos': SyncController._insert_departamento,
+            'medicos': SyncController._insert_medico,
+            'consultas': SyncController._insert_consulta,
+        }
+        return builders[table](registro)
+
+    @staticmethod
+    def _update(table: str, registro: Dict) -> Tuple[str, tuple]:
+        columnas = [c for c in COLUMNAS_TABLAS[table] if c != 'id']
+        query = f"""
+            UPDATE {TABLAS_SQL[table]}
+            SET {', '.join(f'{c} = ?' for c in columnas)}, hash_fila = ?
+            WHERE id = ?
+        """
+        params = (tuple(registro.get(c) for c in columnas)
+                  + (ReconciliacionUtils.hash_registro(table, registro), registro.get('id')))
+        return query, params
+
+    @staticmethod
+    async def _insert_lote(table: str, registros: List[Dict]) -> Tuple[int, int]:
+        """Inserta un lote, sus resúmenes y su registro de cambios en una transacción.
+
+        Si el lote falla se reintenta registro a registro (cada uno con su
+        propia actualización de resumen) para no perder los válidos.
+        Retorna (insertados, errores).
+        """
         try:
-            query = """
-                INSERT INTO Consultas (id, medico_id, nombre_paciente, diagnostico, fecha_consulta)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            params = (
-                registro.get('id'),
-                registro.get('medico_id'),
-                registro.get('nombre_paciente'),
-                registro.get('diagnostico'),
-                registro.get('fecha_consulta')
-            )
-            await execute_query_json(query, params, needs_commit=True)
-            return True
+            await execute_transaction(SyncController._statements(table, registros))
+            CambiosUtils.notificar()
+            return len(registros), 0
         except Exception as e:
-            logger.error(f"Error: {str(e)}")
-            return False
+            logger.warning(f"⚠️ Lote falló, reintentando por registro: {str(e)}")
+
+        insertados = 0
+        errores = 0
+        for registro in registros:
+            try:
+                await execute_transaction(SyncController._statements(table, [registro]))
+                insertados += 1
+            except Exception as e:
+                logger.error(f"Error: {str(e)}")
+                errores += 1
+        if insertados:
+            CambiosUtils.notificar()
+        return insertados, errores
+
+    @staticmethod
+    def _statements(table: str, registros: List[Dict]) -> List[Tuple[str, tuple]]:
+        statements = [SyncController._insert(table, registro) for registro in registros]
+        statements.extend(ResumenUtils.build_updates(table, registros))
+        statements.extend(CambiosUtils.build_inserts(table, registros))
+        return statements
+
+    @staticmethod
+    def _insert_departamento(registro: Dict) -> Tuple[str, tuple]:
+        query = """
+            INSERT INTO Departamentos (id, nombre, ubicacion, fecha_creacion, hash_fila)
+            VALUES (?, ?, ?, ?, ?)
+        """
+        params = (
+            registro.get('id'),
+            registro.get('nombre'),
+            registro.get('ubicacion'),
+            registro.get('fecha_creacion'),
+            ReconciliacionUtils.hash_registro('departamentos', registro)
+        )
+        return query, params
+
+    @staticmethod
+    def _insert_medico(registro: Dict) -> Tuple[str, tuple]:
+        query = """
+            INSERT INTO Medicos (id, departamento_id, nombre, apellido, especialidad, fecha_registro, hash_fila)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        params = (
+            registro.get('id'),
+            registro.get('departamento_id'),
+            registro.get('nombre'),
+            registro.get('apellido'),
+            registro.get('especialidad'),
+            registro.get('fecha_registro'),
+            ReconciliacionUtils.hash_registro('medicos', registro)
+        )
+        return query, params
+
+    @staticmethod
+    def _insert_consulta(registro: Dict) -> Tuple[str, tuple]:
+        query = """
+            INSERT INTO Consultas (id, medico_id, nombre_paciente, diagnostico, fecha_consulta, hash_fila)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+        params = (
+            registro.get('id'),
+            registro.get('medico_id'),
+            registro.get('nombre_paciente'),
+            registro.get('diagnostico'),
+            registro.get('fecha_consulta'),
+            ReconciliacionUtils.hash_registro('consultas', registro)
+        )
+        return query, params
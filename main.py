@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 import os
 
-from routes import sync_router, lectura_router
+from routes import sync_router, lectura_router, resumen_router, cambios_router
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,6 +29,8 @@ app.add_middleware(
 
 app.include_router(sync_router.router, prefix="/api", tags=["Sincronización"])
 app.include_router(lectura_router.router, prefix="/api", tags=["Lectura"])
+app.include_router(resumen_router.router, prefix="/api", tags=["Resumen"])
+app.include_router(cambios_router.router, prefix="/api", tags=["Cambios"])
 
 @app.get("/")
 async def read_root():
@@ -0,0 +1,41 @@
+-- Índices de soporte para los filtros de /api/departamentos, /api/medicos
+-- y /api/consultas (igualdad sobre FKs y rangos sobre columnas de fecha).
+-- Ejecutar sobre la BD réplica (BD2). Es idempotente.
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Departamentos_fecha_creacion'
+               AND object_id = OBJECT_ID('dbo.Departamentos'))
+    CREATE INDEX IX_Departamentos_fecha_creacion
+        ON dbo.Departamentos (fecha_creacion);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Medicos_departamento_id'
+               AND object_id = OBJECT_ID('dbo.Medicos'))
+    CREATE INDEX IX_Medicos_departamento_id
+        ON dbo.Medicos (departamento_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Medicos_especialidad'
+               AND object_id = OBJECT_ID('dbo.Medicos'))
+    CREATE INDEX IX_Medicos_especialidad
+        ON dbo.Medicos (especialidad);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Medicos_fecha_registro'
+               AND object_id = OBJECT_ID('dbo.Medicos'))
+    CREATE INDEX IX_Medicos_fecha_registro
+        ON dbo.Medicos (fecha_registro);
+GO
+
+-- medico_id + fecha_consulta cubre "consultas de un médico en un rango"
+-- y, por ser medico_id la columna líder, también el filtro solo por médico.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Consultas_medico_id_fecha_consulta'
+               AND object_id = OBJECT_ID('dbo.Consultas'))
+    CREATE INDEX IX_Consultas_medico_id_fecha_consulta
+        ON dbo.Consultas (medico_id, fecha_consulta);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Consultas_fecha_consulta'
+               AND object_id = OBJECT_ID('dbo.Consultas'))
+    CREATE INDEX IX_Consultas_fecha_consulta
+        ON dbo.Consultas (fecha_consulta);
+GO
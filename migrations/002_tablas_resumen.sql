@@ -0,0 +1,33 @@
+-- Tablas resumen mantenidas por el motor de sincronización. Cada lote
+-- insertado en Medicos / Consultas suma sus conteos aquí dentro de la
+-- misma transacción (ver utils/resumen_utils.py).
+-- Ejecutar sobre la BD réplica (BD2). Es idempotente.
+
+IF OBJECT_ID('dbo.ResumenMedicosDepartamento', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.ResumenMedicosDepartamento (
+        departamento_id INT NOT NULL PRIMARY KEY,
+        total_medicos   INT NOT NULL DEFAULT 0
+    );
+
+    -- Carga inicial desde los datos ya replicados
+    INSERT INTO dbo.ResumenMedicosDepartamento (departamento_id, total_medicos)
+    SELECT departamento_id, COUNT(*)
+    FROM dbo.Medicos
+    GROUP BY departamento_id;
+END
+GO
+
+IF OBJECT_ID('dbo.ResumenConsultasMedico', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.ResumenConsultasMedico (
+        medico_id       INT NOT NULL PRIMARY KEY,
+        total_consultas INT NOT NULL DEFAULT 0
+    );
+
+    INSERT INTO dbo.ResumenConsultasMedico (medico_id, total_consultas)
+    SELECT medico_id, COUNT(*)
+    FROM dbo.Consultas
+    GROUP BY medico_id;
+END
+GO
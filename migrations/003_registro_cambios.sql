@@ -0,0 +1,34 @@
+-- Registro de cambios de la réplica para consumidores de /api/changes.
+-- El motor de sincronización agrega una fila por registro escrito, en la
+-- misma transacción que el INSERT (ver utils/cambios_utils.py).
+-- Ejecutar sobre la BD réplica (BD2). Es idempotente.
+
+IF OBJECT_ID('dbo.CambiosReplica', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.CambiosReplica (
+        seq          BIGINT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+        tabla        NVARCHAR(50)  NOT NULL,
+        registro_id  INT           NOT NULL,
+        operacion    NVARCHAR(10)  NOT NULL,
+        datos        NVARCHAR(MAX) NULL,
+        fecha_cambio DATETIME2     NOT NULL DEFAULT SYSUTCDATETIME()
+    );
+
+    -- Usado por la purga por retención
+    CREATE INDEX IX_CambiosReplica_fecha_cambio
+        ON dbo.CambiosReplica (fecha_cambio);
+END
+GO
+
+-- Mayor seq eliminado por la purga: un consumidor con since menor a este
+-- valor perdió cambios y debe volver a sincronizar completo.
+IF OBJECT_ID('dbo.CambiosReplicaEstado', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.CambiosReplicaEstado (
+        id          INT    NOT NULL PRIMARY KEY CHECK (id = 1),
+        seq_purgado BIGINT NOT NULL DEFAULT 0
+    );
+
+    INSERT INTO dbo.CambiosReplicaEstado (id, seq_purgado) VALUES (1, 0);
+END
+GO
@@ -0,0 +1,9 @@
+-- Índice para la compactación de CambiosReplica (última entrada por
+-- tabla y registro_id, ver CambiosUtils.purgar).
+-- Ejecutar sobre la BD réplica (BD2). Es idempotente.
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_CambiosReplica_tabla_registro_id'
+               AND object_id = OBJECT_ID('dbo.CambiosReplica'))
+    CREATE INDEX IX_CambiosReplica_tabla_registro_id
+        ON dbo.CambiosReplica (tabla, registro_id, seq);
+GO
@@ -0,0 +1,18 @@
+-- Hash por fila para la reconciliación (ver utils/reconciliacion_utils.py).
+-- La sincronización lo escribe en cada INSERT/UPDATE; con él SQL Server
+-- calcula el hash de cada rango de ids sin enviar las filas a api-sync.
+-- Las filas previas quedan en NULL: la primera reconciliación de cada
+-- tabla los recalcula (y por única vez baja esos rangos de la fuente).
+-- Ejecutar sobre la BD réplica (BD2). Es idempotente.
+
+IF COL_LENGTH('dbo.Departamentos', 'hash_fila') IS NULL
+    ALTER TABLE dbo.Departamentos ADD hash_fila CHAR(64) NULL;
+GO
+
+IF COL_LENGTH('dbo.Medicos', 'hash_fila') IS NULL
+    ALTER TABLE dbo.Medicos ADD hash_fila CHAR(64) NULL;
+GO
+
+IF COL_LENGTH('dbo.Consultas', 'hash_fila') IS NULL
+    ALTER TABLE dbo.Consultas ADD hash_fila CHAR(64) NULL;
+GO
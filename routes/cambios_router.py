@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Query
+from controllers.cambios_controller import CambiosController
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/changes", response_model=dict)
+async def get_cambios(
+    since: int = Query(0, ge=0, description="Último seq procesado por el consumidor"),
+    limit: int = Query(500, ge=1, le=5000, description="Máximo de cambios a devolver"),
+    timeout: float = Query(0, ge=0, le=60,
+                           description="Segundos a esperar si no hay cambios (long-polling)")
+):
+    """
+    GET /api/changes?since=120&limit=500&timeout=30
+
+    Devuelve los registros escritos por la sincronización con seq > since
+    (solo el último cambio de cada registro, el registro se compacta).
+    Responde codigo 410 si el consumidor quedó detrás de la retención.
+    """
+    return await CambiosController.get_cambios(since, limit, timeout)
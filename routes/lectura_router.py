@@ -1,23 +1,48 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from controllers.lectura_controller import LecturaController
 from models import DepartamentoResponse, MedicoResponse, ConsultaResponse
 import logging
-from typing import List
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+FECHA_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+
+
 @router.get("/departamentos", response_model=dict)
-async def get_departamentos():
-    """GET /api/departamentos - Obtener todos los departamentos de BD2"""
-    return await LecturaController.get_departamentos()
+async def get_departamentos(
+    fecha_desde: Optional[str] = Query(None, pattern=FECHA_PATTERN,
+                                       description="fecha_creacion >= YYYY-MM-DD"),
+    fecha_hasta: Optional[str] = Query(None, pattern=FECHA_PATTERN,
+                                       description="fecha_creacion <= YYYY-MM-DD"),
+    fields: Optional[str] = Query(None, description="Columnas separadas por coma")
+):
+    """GET /api/departamentos - Obtener departamentos de BD2 (con filtros opcionales)"""
+    return await LecturaController.get_departamentos(fecha_desde, fecha_hasta, fields)
 
 @router.get("/medicos", response_model=dict)
-async def get_medicos():
-    """GET /api/medicos - Obtener todos los médicos de BD2"""
-    return await LecturaController.get_medicos()
+async def get_medicos(
+    departamento_id: Optional[int] = Query(None, gt=0, description="ID del departamento"),
+    especialidad: Optional[str] = Query(None, max_length=100, description="Especialidad médica"),
+    fecha_desde: Optional[str] = Query(None, pattern=FECHA_PATTERN,
+                                       description="fecha_registro >= YYYY-MM-DD"),
+    fecha_hasta: Optional[str] = Query(None, pattern=FECHA_PATTERN,
+                                       description="fecha_registro <= YYYY-MM-DD"),
+    fields: Optional[str] = Query(None, description="Columnas separadas por coma")
+):
+    """GET /api/medicos - Obtener médicos de BD2 (con filtros opcionales)"""
+    return await LecturaController.get_medicos(
+        departamento_id, especialidad, fecha_desde, fecha_hasta, fields)
 
 @router.get("/consultas", response_model=dict)
-async def get_consultas():
-    """GET /api/consultas - Obtener todas las consultas de BD2"""
-    return await LecturaController.get_consultas()
\ No newline at end of file
+async def get_consultas(
+    medico_id: Optional[int] = Query(None, gt=0, description="ID del médico"),
+    fecha_desde: Optional[str] = Query(None, pattern=FECHA_PATTERN,
+                                       description="fecha_consulta >= YYYY-MM-DD"),
+    fecha_hasta: Optional[str] = Query(None, pattern=FECHA_PATTERN,
+                                       description="fecha_consulta <= YYYY-MM-DD"),
+    fields: Optional[str] = Query(None, description="Columnas separadas por coma")
+):
+    """GET /api/consultas - Obtener consultas de BD2 (con filtros opcionales)"""
+    return await LecturaController.get_consultas(medico_id, fecha_desde, fecha_hasta, fields)
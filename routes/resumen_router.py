@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Query
+from controllers.resumen_controller import ResumenController
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/resumen/medicos-por-departamento", response_model=dict)
+async def get_medicos_por_departamento(
+    departamento_id: Optional[int] = Query(None, gt=0, description="ID del departamento")
+):
+    """GET /api/resumen/medicos-por-departamento - Conteo de médicos por departamento"""
+    return await ResumenController.get_medicos_por_departamento(departamento_id)
+
+
+@router.get("/resumen/consultas-por-medico", response_model=dict)
+async def get_consultas_por_medico(
+    medico_id: Optional[int] = Query(None, gt=0, description="ID del médico")
+):
+    """GET /api/resumen/consultas-por-medico - Conteo de consultas por médico"""
+    return await ResumenController.get_consultas_por_medico(medico_id)
@@ -19,3 +19,18 @@ async def sincronizar(
     """
     logger.info(f"🔄 POST /api/sync - table={table}, fecha_mayor={fecha_mayor}")
     return await SyncController.sync(table, fecha_mayor)
+
+
+@router.post("/sync/reconciliar")
+async def reconciliar(
+    table: str = Query(...,
+                       description="Tabla: departamentos, medicos, consultas")
+):
+    """
+    POST /api/sync/reconciliar?table=medicos
+
+    Compara hashes por rangos de id con API Fuente y repara solo las
+    filas que difieren (faltantes, modificadas o eliminadas en la fuente)
+    """
+    logger.info(f"🔍 POST /api/sync/reconciliar - table={table}")
+    return await SyncController.reconciliar(table)
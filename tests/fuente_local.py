@@ -0,0 +1,154 @@
+"""
+API Fuente local (BD1 en memoria) para probar la sincronización y la
+reconciliación sin depender del servidor real. Solo para pruebas: no se
+incluye en la imagen (ver .dockerignore).
+
+Desde la raíz del repo:
+
+    FUENTE_LOCAL_DATOS=datos.json python -m uvicorn fuente_local:app --app-dir tests --port 8000
+
+datos.json: {"departamentos": [...], "medicos": [...], "consultas": [...]}
+
+Además de los endpoints que consume api-sync, expone PUT y DELETE por id
+para provocar divergencias entre la fuente y la réplica.
+"""
+from fastapi import FastAPI, Query, Body
+from datetime import datetime
+import json
+import logging
+import os
+from typing import Dict, Any, List, Optional
+
+from utils.filtros_utils import TABLAS_SQL, COLUMNA_FECHA
+from utils.reconciliacion_utils import ReconciliacionUtils
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FuenteLocal:
+
+    def __init__(self, datos: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.tablas = {
+            table: {int(r['id']): dict(r) for r in (datos or {}).get(table, [])}
+            for table in TABLAS_SQL
+        }
+
+    @classmethod
+    def desde_archivo(cls, ruta: Optional[str]) -> "FuenteLocal":
+        if not ruta:
+            return cls()
+        with open(ruta, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _ordenados(self, table: str) -> List[Dict[str, Any]]:
+        filas = self.tablas[table]
+        return [filas[i] for i in sorted(filas)]
+
+    def listar(self, table: str, fecha_mayor: Optional[str]) -> List[Dict[str, Any]]:
+        registros = self._ordenados(table)
+        if not fecha_mayor:
+            return registros
+        desde = datetime.strptime(fecha_mayor, '%Y-%m-%d')
+        columna = COLUMNA_FECHA[table]
+        return [
+            r for r in registros
+            if r.get(columna) and datetime.fromisoformat(str(r[columna])) > desde
+        ]
+
+    def rango(self, table: str, id_desde: int, id_hasta: int) -> List[Dict[str, Any]]:
+        return [r for r in self._ordenados(table) if id_desde <= int(r['id']) <= id_hasta]
+
+    def hashes(
+        self,
+        table: str,
+        particiones: int,
+        id_desde: Optional[int],
+        id_hasta: Optional[int]
+    ) -> Dict[str, Any]:
+        ids = sorted(self.tablas[table])
+        id_min = ids[0] if ids else None
+        id_max = ids[-1] if ids else None
+
+        desde = id_desde if id_desde is not None else id_min
+        hasta = id_hasta if id_hasta is not None else id_max
+        rangos = []
+        if desde is not None and hasta is not None:
+            rangos = ReconciliacionUtils.resumir_rangos(
+                table, self.rango(table, desde, hasta), desde, hasta, particiones)
+
+        return {"id_min": id_min, "id_max": id_max, "rangos": rangos}
+
+    def guardar(self, table: str, id_registro: int, registro: Dict[str, Any]) -> Dict[str, Any]:
+        registro = {**registro, "id": id_registro}
+        self.tablas[table][id_registro] = registro
+        return registro
+
+    def eliminar(self, table: str, id_registro: int) -> bool:
+        return self.tablas[table].pop(id_registro, None) is not None
+
+
+fuente = FuenteLocal.desde_archivo(os.getenv("FUENTE_LOCAL_DATOS"))
+
+app = FastAPI(
+    title="Hospital API - Fuente local (BD1)",
+    description="API Fuente en memoria para pruebas de api-sync",
+    version="1.0.0",
+)
+
+
+def _tabla_invalida(table: str) -> Dict[str, Any]:
+    return {
+        "exito": False,
+        "codigo": 400,
+        "mensaje": f"Tabla inválida. Usar: {', '.join(TABLAS_SQL)}"
+    }
+
+
+@app.get("/api/{table}")
+async def listar(table: str, fecha_mayor: Optional[str] = Query(None)):
+    if table not in TABLAS_SQL:
+        return _tabla_invalida(table)
+    datos = fuente.listar(table, fecha_mayor)
+    return {"exito": True, "codigo": 200, "mensaje": f"{len(datos)} registros", "datos": datos}
+
+
+@app.get("/api/{table}/hashes")
+async def hashes(
+    table: str,
+    particiones: int = Query(16, ge=1, le=1024),
+    id_desde: Optional[int] = Query(None),
+    id_hasta: Optional[int] = Query(None)
+):
+    if table not in TABLAS_SQL:
+        return _tabla_invalida(table)
+    datos = fuente.hashes(table, particiones, id_desde, id_hasta)
+    return {"exito": True, "codigo": 200, "mensaje": f"{len(datos['rangos'])} rangos", "datos": datos}
+
+
+@app.get("/api/{table}/rango")
+async def rango(table: str, id_desde: int = Query(...), id_hasta: int = Query(...)):
+    if table not in TABLAS_SQL:
+        return _tabla_invalida(table)
+    datos = fuente.rango(table, id_desde, id_hasta)
+    return {"exito": True, "codigo": 200, "mensaje": f"{len(datos)} registros", "datos": datos}
+
+
+@app.put("/api/{table}/{id_registro}")
+async def guardar(table: str, id_registro: int, registro: Dict[str, Any] = Body(...)):
+    if table not in TABLAS_SQL:
+        return _tabla_invalida(table)
+    datos = fuente.guardar(table, id_registro, registro)
+    return {"exito": True, "codigo": 200, "mensaje": "Registro guardado", "datos": datos}
+
+
+@app.delete("/api/{table}/{id_registro}")
+async def eliminar(table: str, id_registro: int):
+    if table not in TABLAS_SQL:
+        return _tabla_invalida(table)
+    if not fuente.eliminar(table, id_registro):
+        return {"exito": False, "codigo": 404, "mensaje": "Registro no encontrado"}
+    return {"exito": True, "codigo": 200, "mensaje": "Registro eliminado"}
@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+import re
+from collections import Counter
+
+import httpx
+import pytest
+
+import controllers.sync_controller as sync_controller
+import utils.cambios_utils as cambios_utils
+import utils.sync_utils as sync_utils
+from controllers.sync_controller import SyncController, UMBRAL_REPARACION
+from utils.filtros_utils import COLUMNA_FECHA, TABLAS_SQL
+from utils.reconciliacion_utils import ReconciliacionUtils
+
+import fuente_local
+from fuente_local import FuenteLocal
+
+
+TOTAL_CONSULTAS = 2000
+
+
+class ReplicaEnMemoria:
+    """BD2 falsa: interpreta las sentencias que emite el motor de
+    sincronización sobre diccionarios en memoria."""
+
+    def __init__(self):
+        self.tablas = {table: {} for table in TABLAS_SQL}
+        self.resumen = Counter()
+        self.cambios = []
+        self.filas_leidas = 0
+        self.consultas_hash = 0
+
+    def _table(self, nombre_sql):
+        return next(t for t, n in TABLAS_SQL.items() if n == nombre_sql)
+
+    def _como_bd(self, table, fila):
+        # pyodbc devuelve datetime y execute_query_json lo serializa con str()
+        fila = dict(fila)
+        columna = COLUMNA_FECHA[table]
+        if isinstance(fila.get(columna), str):
+            fila[columna] = fila[columna].replace('T', ' ')
+        return fila
+
+    async def execute_query_json(self, sql, params=None, needs_commit=False):
+        m = re.search(r"FROM (\w+)$", sql.strip())
+        if "MIN(id)" in sql and m:
+            filas = self.tablas[self._table(m.group(1))]
+            return json.dumps([{"id_min": min(filas, default=None),
+                                "id_max": max(filas, default=None)}])
+
+        if "HASHBYTES" in sql:
+            self.consultas_hash += 1
+            filas = self.tablas[self._table(re.search(r"JOIN (\w+) t", sql).group(1))]
+            resultado = []
+            for id_desde, id_hasta in zip(params[::2], params[1::2]):
+                ids = sorted(i for i in filas if id_desde <= i <= id_hasta)
+                if not ids:
+                    continue
+                hashes = [filas[i]['hash_fila'] for i in ids if filas[i].get('hash_fila')]
+                resultado.append({
+                    "id_desde": id_desde,
+                    "cantidad": len(ids),
+                    "hash": hashlib.sha256(''.join(hashes).encode('ascii')).hexdigest()
+                    if hashes else None
+                })
+            return json.dumps(resultado)
+
+        m = re.search(r"SELECT \* FROM (\w+) WHERE id BETWEEN", sql)
+        if m:
+            table = self._table(m.group(1))
+            id_desde, id_hasta = params
+            filas = [self._como_bd(table, f) for i, f in sorted(self.tablas[table].items())
+                     if id_desde <= i <= id_hasta]
+            self.filas_leidas += len(filas)
+            return json.dumps(filas, default=str)
+
+        raise AssertionError(f"Consulta no soportada: {sql}")
+
+    async def execute_transaction(self, statements):
+        # Se aplica sobre una copia para respetar el rollback
+        tablas = {t: dict(f) for t, f in self.tablas.items()}
+        resumen = Counter(self.resumen)
+        cambios = list(self.cambios)
+
+        for sql, params in statements:
+            sql = " ".join(sql.split())
+            if m := re.match(r"INSERT INTO CambiosReplica", sql):
+                cambios.append(params)
+            elif m := re.match(r"INSERT INTO (\w+) \(([^)]*)\)", sql):
+                table = self._table(m.group(1))
+                fila = dict(zip([c.strip() for c in m.group(2).split(',')], params))
+                if fila['id'] in tablas[table]:
+                    raise Exception("Violación de PRIMARY KEY")
+                tablas[table][fila['id']] = fila
+            elif m := re.match(r"UPDATE Resumen\w+ WITH", sql):
+                resumen[params[1]] += params[0]
+            elif m := re.match(r"UPDATE (\w+) SET (.*) WHERE id = \?", sql):
+                table = self._table(m.group(1))
+                columnas = [c.split('=')[0].strip() for c in m.group(2).split(',')]
+                tablas[table][params[-1]].update(zip(columnas, params[:-1]))
+            elif m := re.match(r"DELETE FROM Resumen\w+", sql):
+                if resumen[params[0]] <= 0:
+                    del resumen[params[0]]
+            elif m := re.match(r"DELETE FROM (\w+) WHERE id = \?", sql):
+                del tablas[self._table(m.group(1))][params[0]]
+            elif not sql.startswith(("EXEC sp_getapplock", "DELETE c FROM CambiosReplica")):
+                raise AssertionError(f"Sentencia no soportada: {sql}")
+
+        self.tablas, self.resumen, self.cambios = tablas, resumen, cambios
+
+
+def _consulta(id_consulta, **cambios):
+    return {
+        "id": id_consulta,
+        "medico_id": id_consulta % 7 + 1,
+        "nombre_paciente": "Ana Ruiz",
+        "diagnostico": "Control",
+        "fecha_consulta": f"2024-01-{id_consulta % 28 + 1:02d}T10:00:00",
+        **cambios
+    }
+
+
+@pytest.fixture
+def entorno(monkeypatch):
+    """Fuente local servida por ASGI y réplica en memoria ya sincronizada"""
+    fuente = FuenteLocal({"consultas": [_consulta(i) for i in range(1, TOTAL_CONSULTAS + 1)]})
+    monkeypatch.setattr(fuente_local, "fuente", fuente)
+
+    cliente_real = httpx.AsyncClient
+    monkeypatch.setattr(
+        sync_utils.httpx, "AsyncClient",
+        lambda **kwargs: cliente_real(transport=httpx.ASGITransport(app=fuente_local.app), **kwargs))
+
+    replica = ReplicaEnMemoria()
+    monkeypatch.setattr(sync_controller, "execute_query_json", replica.execute_query_json)
+    monkeypatch.setattr(sync_controller, "execute_transaction", replica.execute_transaction)
+    monkeypatch.setattr(cambios_utils, "execute_transaction", replica.execute_transaction)
+
+    asyncio.run(replica.execute_transaction(
+        SyncController._statements('consultas', fuente.listar('consultas', None))))
+    replica.cambios.clear()
+
+    return fuente, replica
+
+
+def _reconciliar():
+    respuesta = asyncio.run(SyncController.reconciliar('consultas'))
+    assert respuesta["exito"], respuesta
+    return respuesta["datos"]
+
+
+def _assert_convergen(fuente, replica):
+    filas_fuente = {r['id']: r for r in fuente.listar('consultas', None)}
+    filas_replica = replica.tablas['consultas']
+    assert filas_replica.keys() == filas_fuente.keys()
+    for id_consulta, fila in filas_fuente.items():
+        assert filas_replica[id_consulta]['hash_fila'] == \
+            ReconciliacionUtils.hash_registro('consultas', fila)
+
+    esperado = Counter(f['medico_id'] for f in filas_replica.values())
+    assert replica.resumen == esperado
+
+
+def test_reconciliar_repara_faltantes_distintos_y_eliminados(entorno):
+    fuente, replica = entorno
+    fuente.eliminar('consultas', 10)
+    fuente.eliminar('consultas', 1500)
+    fuente.guardar('consultas', 77, _consulta(77, diagnostico="Hipertension", medico_id=3))
+    fuente.guardar('consultas', 2001, _consulta(2001))
+    fuente.guardar('consultas', 2002, _consulta(2002))
+    # Fila que nunca llegó a BD2 (ni al resumen, que va en la misma transacción)
+    perdida = replica.tablas['consultas'].pop(1234)
+    replica.resumen[perdida['medico_id']] -= 1
+    # Fila solo en BD2 y fuera del rango de ids de la fuente
+    replica.tablas['consultas'][2500] = {**_consulta(2500), "hash_fila": "x" * 64}
+    replica.resumen[_consulta(2500)['medico_id']] += 1
+
+    datos = _reconciliar()
+
+    assert datos["insertados"] == 3
+    assert datos["actualizados"] == 1
+    assert datos["eliminados"] == 3
+    assert datos["errores"] == 0
+    _assert_convergen(fuente, replica)
+
+    operaciones = {(c[1], c[2]) for c in replica.cambios}
+    assert operaciones == {
+        (1234, 'insert'), (2001, 'insert'), (2002, 'insert'),
+        (77, 'update'),
+        (10, 'delete'), (1500, 'delete'), (2500, 'delete'),
+    }
+
+
+def test_rango_grande_se_parte_y_solo_baja_lo_distinto(entorno):
+    fuente, replica = entorno
+    fuente.guardar('consultas', 999, _consulta(999, diagnostico="Diabetes Tipo 2"))
+
+    datos = _reconciliar()
+
+    # 2000 filas en 16 particiones superan el umbral: debe bajar un nivel
+    assert TOTAL_CONSULTAS / 16 > UMBRAL_REPARACION
+    assert replica.consultas_hash > 1
+    assert datos["rangos_reparados"] == 1
+    assert datos["actualizados"] == 1
+    assert datos["filas_transferidas"] <= UMBRAL_REPARACION
+    # BD2 nunca manda más filas que las del rango reparado
+    assert replica.filas_leidas <= UMBRAL_REPARACION
+    _assert_convergen(fuente, replica)
+
+
+def test_segunda_pasada_no_repara_nada(entorno):
+    fuente, replica = entorno
+    fuente.eliminar('consultas', 5)
+    fuente.guardar('consultas', 1800, _consulta(1800, nombre_paciente="Pedro Gonzalez"))
+    _reconciliar()
+    replica.filas_leidas = 0
+
+    datos = _reconciliar()
+
+    assert datos["rangos_comparados"] == 16
+    assert datos["rangos_reparados"] == 0
+    assert datos["filas_transferidas"] == 0
+    assert datos["insertados"] == datos["actualizados"] == datos["eliminados"] == 0
+    assert replica.filas_leidas == 0
+
+
+def test_hash_fila_nulo_se_recalcula_sin_registrar_cambios(entorno):
+    fuente, replica = entorno
+    for id_consulta in (3, 4, 5):
+        replica.tablas['consultas'][id_consulta]['hash_fila'] = None
+
+    datos = _reconciliar()
+
+    assert datos["hashes_recalculados"] == 3
+    assert datos["actualizados"] == 0
+    assert replica.cambios == []
+    _assert_convergen(fuente, replica)
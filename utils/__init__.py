@@ -1,8 +1,18 @@
-from .db_connection import execute_query_json, get_db_connection
+from .db_connection import execute_query_json, execute_transaction, get_db_connection
 from .sync_utils import SyncUtils
+from .filtros_utils import FiltrosUtils, FiltroInvalido
+from .resumen_utils import ResumenUtils
+from .cambios_utils import CambiosUtils
+from .reconciliacion_utils import ReconciliacionUtils
 
 __all__ = [
     "execute_query_json",
+    "execute_transaction",
     "get_db_connection",
     "SyncUtils",
+    "FiltrosUtils",
+    "FiltroInvalido",
+    "ResumenUtils",
+    "CambiosUtils",
+    "ReconciliacionUtils",
 ]
\ No newline at end of file
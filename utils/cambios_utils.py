@@ -0,0 +1,135 @@
+import asyncio
+import json
+import logging
+import os
+from typing import List, Dict, Any, Tuple
+
+from utils.db_connection import execute_query_json, execute_transaction
+from utils.filtros_utils import COLUMNAS_TABLAS
+
+logger = logging.getLogger(__name__)
+
+CAMBIOS_RETENCION_DIAS = int(os.getenv("CAMBIOS_RETENCION_DIAS", "7"))
+
+# Despertador para long-polling dentro del proceso. Otros procesos que
+# escriban en la réplica se detectan con el sondeo periódico del controller.
+_nuevo_cambio = asyncio.Event()
+
+
+class CambiosUtils:
+
+    @staticmethod
+    def build_inserts(
+        table: str,
+        registros: List[Dict[str, Any]],
+        operacion: str = 'insert'
+    ) -> List[Tuple[str, tuple]]:
+        """Sentencias que registran los registros escritos en CambiosReplica.
+
+        operacion es 'insert', 'update' o 'delete' (para 'delete' no se
+        guardan datos).
+        """
+        return CambiosUtils.build_entradas(table, [(r, operacion) for r in registros])
+
+    @staticmethod
+    def build_entradas(
+        table: str,
+        entradas: List[Tuple[Dict[str, Any], str]]
+    ) -> List[Tuple[str, tuple]]:
+        """Como build_inserts, pero con una operación por registro.
+
+        Deben ejecutarse en la misma transacción que la escritura y después
+        de todas las sentencias de datos y resumen. El applock serializa a
+        los escritores hasta el commit, así los seq se hacen visibles en
+        orden y un consumidor nunca salta uno que aún no se confirmó. Tomarlo
+        al final mantiene el mismo orden de bloqueos en todas las
+        transacciones.
+        """
+        if not entradas:
+            return []
+
+        columnas = COLUMNAS_TABLAS[table]
+        statements = [(
+            "EXEC sp_getapplock @Resource = 'CambiosReplica', "
+            "@LockMode = 'Exclusive', @LockOwner = 'Transaction'",
+            None
+        )]
+        query = """
+            INSERT INTO CambiosReplica (tabla, registro_id, operacion, datos)
+            VALUES (?, ?, ?, ?)
+        """
+        for registro, operacion in entradas:
+            datos = None
+            if operacion != 'delete':
+                datos = json.dumps({c: registro.get(c) for c in columnas},
+                                   default=str, separators=(',', ':'))
+            statements.append((query, (
+                table,
+                registro.get('id'),
+                operacion,
+                datos
+            )))
+        return statements
+
+    @staticmethod
+    def notificar():
+        """Despierta a los consumidores en espera en /api/changes"""
+        global _nuevo_cambio
+        evento = _nuevo_cambio
+        _nuevo_cambio = asyncio.Event()
+        evento.set()
+
+    @staticmethod
+    async def esperar(timeout: float) -> bool:
+        """Espera hasta `timeout` segundos a que se registren cambios"""
+        try:
+            await asyncio.wait_for(_nuevo_cambio.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    @staticmethod
+    async def purgar(dias: int = CAMBIOS_RETENCION_DIAS) -> None:
+        """Compacta el registro y elimina los cambios más antiguos que la
+        retención.
+
+        Compactar deja solo la última entrada de cada (tabla, registro_id):
+        un consumidor con cualquier `since` sigue recibiendo el estado final
+        de todo registro que cambió después de su `since`, así que la
+        compactación no mueve seq_purgado.
+
+        Deja en CambiosReplicaEstado el mayor seq eliminado por retención
+        para que los consumidores con un `since` menor sepan que se quedaron
+        atrás.
+        """
+        query = """
+            DELETE c FROM CambiosReplica c
+            WHERE EXISTS (
+                SELECT 1 FROM CambiosReplica n
+                WHERE n.tabla = c.tabla
+                  AND n.registro_id = c.registro_id
+                  AND n.seq > c.seq
+            );
+
+            DECLARE @hasta BIGINT = (
+                SELECT MAX(seq) FROM CambiosReplica
+                WHERE fecha_cambio < DATEADD(day, -?, SYSUTCDATETIME())
+            );
+            IF @hasta IS NOT NULL
+            BEGIN
+                DELETE FROM CambiosReplica WHERE seq <= @hasta;
+                UPDATE CambiosReplicaEstado
+                SET seq_purgado = @hasta
+                WHERE id = 1 AND seq_purgado < @hasta;
+            END
+        """
+        await execute_transaction([(query, (dias,))])
+
+    @staticmethod
+    async def seq_purgado() -> int:
+        resultado_json = await execute_query_json(
+            "SELECT seq_purgado FROM CambiosReplicaEstado WHERE id = 1")
+        resultado = json.loads(resultado_json)
+        if resultado:
+            return int(resultado[0].get('seq_purgado', 0))
+        return 0
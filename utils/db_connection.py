@@ -88,3 +88,55 @@ async def execute_query_json(sql_template, params=None, needs_commit=False):
         if conn:
             conn.close()
             logger.info("Conexión cerrada.")
+
+
+async def execute_transaction(statements):
+    """Ejecuta varias sentencias (sql, params) en una sola transacción.
+
+    Hace commit solo si todas tienen éxito; ante cualquier error hace
+    rollback de todo el lote y relanza la excepción.
+    """
+
+    conn = None
+    cursor = None
+    try:
+        conn = await get_db_connection()
+        conn.autocommit = False
+        cursor = conn.cursor()
+        logger.info(f"Ejecutando transacción con {len(statements)} sentencias")
+
+        for sql_template, params in statements:
+            if params:
+                cursor.execute(sql_template, params)
+            else:
+                cursor.execute(sql_template)
+
+        logger.info("Realizando commit de la transacción.")
+        conn.commit()
+
+    except pyodbc.Error as e:
+        logger.error(
+            f"Error en la transacción (SQLSTATE: {e.args[0]}): {str(e)}")
+        if conn:
+            try:
+                logger.warning("Realizando rollback debido a error.")
+                conn.rollback()
+            except pyodbc.Error as rb_e:
+                logger.error(f"Error durante el rollback: {rb_e}")
+
+        raise Exception(f"Error ejecutando transacción: {str(e)}") from e
+    except Exception as e:
+        logger.error(
+            f"Error inesperado durante la transacción: {str(e)}")
+        if conn:
+            try:
+                conn.rollback()
+            except pyodbc.Error as rb_e:
+                logger.error(f"Error durante el rollback: {rb_e}")
+        raise
+    finally:
+        if cursor:
+            cursor.close()
+        if conn:
+            conn.close()
+            logger.info("Conexión cerrada.")
@@ -0,0 +1,127 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Columnas permitidas por tabla. Solo estos nombres llegan al SQL;
+# los valores siempre viajan como parámetros.
+COLUMNAS_TABLAS = {
+    'departamentos': ['id', 'nombre', 'ubicacion', 'fecha_creacion'],
+    'medicos': ['id', 'departamento_id', 'nombre', 'apellido',
+                'especialidad', 'fecha_registro'],
+    'consultas': ['id', 'medico_id', 'nombre_paciente', 'diagnostico',
+                  'fecha_consulta'],
+}
+
+TABLAS_SQL = {
+    'departamentos': 'Departamentos',
+    'medicos': 'Medicos',
+    'consultas': 'Consultas',
+}
+
+COLUMNA_FECHA = {
+    'departamentos': 'fecha_creacion',
+    'medicos': 'fecha_registro',
+    'consultas': 'fecha_consulta',
+}
+
+
+class FiltroInvalido(ValueError):
+    """Parámetro de filtrado o proyección inválido (se responde con 400)"""
+    pass
+
+
+class FiltrosUtils:
+
+    @staticmethod
+    def parse_fields(table: str, fields: Optional[str]) -> Optional[List[str]]:
+        """Convierte 'fields=a,b' en la lista de columnas a seleccionar.
+
+        Retorna None si no se pidió proyección. El id siempre se incluye.
+        """
+        if fields is None:
+            return None
+
+        columnas_validas = COLUMNAS_TABLAS[table]
+        solicitadas = [f.strip() for f in fields.split(',') if f.strip()]
+        if not solicitadas:
+            raise FiltroInvalido("El parámetro fields está vacío")
+
+        invalidas = [c for c in solicitadas if c not in columnas_validas]
+        if invalidas:
+            raise FiltroInvalido(
+                f"Campos inválidos: {', '.join(invalidas)}. "
+                f"Usar: {', '.join(columnas_validas)}"
+            )
+
+        # Mantener el orden de la tabla y evitar duplicados
+        return [c for c in columnas_validas if c == 'id' or c in solicitadas]
+
+    @staticmethod
+    def parse_fecha(valor: Optional[str], nombre: str) -> Optional[datetime]:
+        if valor is None:
+            return None
+        try:
+            return datetime.strptime(valor, '%Y-%m-%d')
+        except ValueError:
+            raise FiltroInvalido(
+                f"Formato de fecha inválido en {nombre}. Usar YYYY-MM-DD")
+
+    @staticmethod
+    def build_select(
+        table: str,
+        fields: Optional[str] = None,
+        igualdad: Optional[Dict[str, Any]] = None,
+        fecha_desde: Optional[str] = None,
+        fecha_hasta: Optional[str] = None
+    ) -> Tuple[str, Tuple[Any, ...], Optional[List[str]]]:
+        """Arma un SELECT parametrizado para una tabla de la réplica.
+
+        - igualdad: {columna: valor}; los valores None se ignoran.
+        - fecha_desde / fecha_hasta: rango inclusivo (YYYY-MM-DD) sobre la
+          columna de fecha de la tabla. Se compila como
+          `fecha >= desde AND fecha < hasta + 1 día` para que el índice
+          sobre la columna pueda usarse sin aplicar funciones a la columna.
+
+        Retorna (query, params, columnas_proyectadas).
+        """
+        if table not in TABLAS_SQL:
+            raise FiltroInvalido(
+                f"Tabla inválida. Usar: {', '.join(TABLAS_SQL)}")
+
+        columnas_validas = COLUMNAS_TABLAS[table]
+        proyeccion = FiltrosUtils.parse_fields(table, fields)
+
+        condiciones = []
+        params = []
+
+        for columna, valor in (igualdad or {}).items():
+            if valor is None:
+                continue
+            if columna not in columnas_validas:
+                raise FiltroInvalido(f"Filtro inválido: {columna}")
+            condiciones.append(f"{columna} = ?")
+            params.append(valor)
+
+        desde = FiltrosUtils.parse_fecha(fecha_desde, 'fecha_desde')
+        hasta = FiltrosUtils.parse_fecha(fecha_hasta, 'fecha_hasta')
+        if desde and hasta and desde > hasta:
+            raise FiltroInvalido("fecha_desde no puede ser mayor que fecha_hasta")
+
+        columna_fecha = COLUMNA_FECHA[table]
+        if desde:
+            condiciones.append(f"{columna_fecha} >= ?")
+            params.append(desde)
+        if hasta:
+            condiciones.append(f"{columna_fecha} < ?")
+            params.append(hasta + timedelta(days=1))
+
+        select = ', '.join(proyeccion) if proyeccion else '*'
+        query = f"SELECT {select} FROM {TABLAS_SQL[table]}"
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        query += " ORDER BY id"
+
+        return query, tuple(params), proyeccion
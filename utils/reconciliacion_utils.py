@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from utils.filtros_utils import COLUMNAS_TABLAS, COLUMNA_FECHA, TABLAS_SQL
+
+logger = logging.getLogger(__name__)
+
+
+# Contrato compartido con la API Fuente: ambos lados deben calcular
+# exactamente el mismo hash para el mismo contenido.
+#
+#   GET /api/{table}/hashes?id_desde=&id_hasta=&particiones=
+#       -> datos: {id_min, id_max, rangos: [{id_desde, id_hasta, cantidad, hash}]}
+#          (sin id_desde/id_hasta se usa el rango de ids propio)
+#   GET /api/{table}/rango?id_desde=&id_hasta=
+#       -> datos: [registros con id en el rango, ordenados por id]
+#
+# Hash de un rango: SHA-256 de la concatenación, ordenada por id, de los
+# hash_registro (hex) de sus filas. En BD2 cada fila guarda su hash_registro
+# en hash_fila, así el hash de un rango se calcula en SQL Server.
+
+HASH_VACIO = hashlib.sha256().hexdigest()
+
+
+class ReconciliacionUtils:
+
+    @staticmethod
+    def _normalizar_fecha(valor: Any) -> Optional[str]:
+        if valor is None:
+            return None
+        if isinstance(valor, str):
+            valor = datetime.fromisoformat(valor)
+        return valor.replace(tzinfo=None).isoformat()
+
+    @staticmethod
+    def hash_registro(table: str, registro: Dict[str, Any]) -> str:
+        """Hash canónico de un registro: columnas de la tabla en orden fijo,
+        fechas en ISO 8601 sin zona y el resto como llega en JSON."""
+        columna_fecha = COLUMNA_FECHA[table]
+        valores = []
+        for columna in COLUMNAS_TABLAS[table]:
+            valor = registro.get(columna)
+            if columna == columna_fecha:
+                valor = ReconciliacionUtils._normalizar_fecha(valor)
+            elif (columna == 'id' or columna.endswith('_id')) and valor is not None:
+                valor = int(valor)
+            valores.append(valor)
+        canonico = json.dumps(valores, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def particionar(id_desde: int, id_hasta: int, particiones: int) -> List[Tuple[int, int]]:
+        """Divide [id_desde, id_hasta] en hasta `particiones` rangos contiguos
+        de ancho parejo. Ambos lados deben usar esta misma división."""
+        total = id_hasta - id_desde + 1
+        if total <= 0:
+            return []
+        particiones = max(1, min(particiones, total))
+        ancho, resto = divmod(total, particiones)
+
+        rangos = []
+        inicio = id_desde
+        for i in range(particiones):
+            fin = inicio + ancho - 1 + (1 if i < resto else 0)
+            rangos.append((inicio, fin))
+            inicio = fin + 1
+        return rangos
+
+    @staticmethod
+    def resumir_rangos(
+        table: str,
+        registros: List[Dict[str, Any]],
+        id_desde: int,
+        id_hasta: int,
+        particiones: int
+    ) -> List[Dict[str, Any]]:
+        """Cantidad y hash de los registros de cada partición de [id_desde, id_hasta].
+
+        `registros` debe venir ordenado por id y limitado al rango.
+        """
+        rangos = ReconciliacionUtils.particionar(id_desde, id_hasta, particiones)
+        resumen = []
+        i = 0
+        for inicio, fin in rangos:
+            acumulado = hashlib.sha256()
+            cantidad = 0
+            while i < len(registros) and int(registros[i]['id']) <= fin:
+                if int(registros[i]['id']) >= inicio:
+                    acumulado.update(
+                        ReconciliacionUtils.hash_registro(table, registros[i]).encode('ascii'))
+                    cantidad += 1
+                i += 1
+            resumen.append({
+                "id_desde": inicio,
+                "id_hasta": fin,
+                "cantidad": cantidad,
+                "hash": acumulado.hexdigest()
+            })
+        return resumen
+
+    @staticmethod
+    def build_hashes_sql(table: str, rangos: List[Tuple[int, int]]) -> Tuple[str, tuple]:
+        """SELECT que devuelve (id_desde, cantidad, hash) por rango, calculado
+        sobre hash_fila con el mismo algoritmo que resumir_rangos.
+
+        Los rangos sin filas no aparecen (ver completar_rangos). Si alguna
+        fila del rango tiene hash_fila NULL el hash no coincide con el de la
+        fuente, y la reparación lo recalcula.
+        """
+        valores = ", ".join("(?, ?)" for _ in rangos)
+        query = f"""
+            SELECT p.id_desde,
+                   COUNT(*) AS cantidad,
+                   LOWER(CONVERT(VARCHAR(64), HASHBYTES('SHA2_256',
+                       STRING_AGG(CAST(t.hash_fila AS VARCHAR(MAX)), '')
+                           WITHIN GROUP (ORDER BY t.id)), 2)) AS hash
+            FROM (VALUES {valores}) AS p(id_desde, id_hasta)
+            JOIN {TABLAS_SQL[table]} t ON t.id BETWEEN p.id_desde AND p.id_hasta
+            GROUP BY p.id_desde
+        """
+        params = tuple(v for rango in rangos for v in rango)
+        return query, params
+
+    @staticmethod
+    def completar_rangos(rangos: List[Tuple[int, int]], filas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Arma el resumen de cada rango con el resultado de build_hashes_sql"""
+        por_desde = {int(f['id_desde']): f for f in filas}
+        resumen = []
+        for id_desde, id_hasta in rangos:
+            fila = por_desde.get(id_desde)
+            resumen.append({
+                "id_desde": id_desde,
+                "id_hasta": id_hasta,
+                "cantidad": int(fila['cantidad']) if fila else 0,
+                "hash": fila.get('hash') if fila else HASH_VACIO
+            })
+        return resumen
+
+    @staticmethod
+    def diferencias(
+        table: str,
+        fuente: List[Dict[str, Any]],
+        replica: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict], List[Tuple[Dict, Dict]], List[Dict]]:
+        """Compara los registros de un rango.
+
+        Retorna (faltantes, distintos, sobrantes): filas de la fuente que no
+        están en la réplica, pares (fuente, réplica) cuyo hash_fila no es el
+        hash de la fila de la fuente y filas de la réplica que ya no existen
+        en la fuente.
+        """
+        por_id_replica = {int(r['id']): r for r in replica}
+        ids_fuente = set()
+        faltantes = []
+        distintos = []
+
+        for registro in fuente:
+            id_registro = int(registro['id'])
+            ids_fuente.add(id_registro)
+            local = por_id_replica.get(id_registro)
+            if local is None:
+                faltantes.append(registro)
+            elif ReconciliacionUtils.hash_registro(table, registro) != local.get('hash_fila'):
+                distintos.append((registro, local))
+
+        sobrantes = [r for i, r in por_id_replica.items() if i not in ids_fuente]
+        return faltantes, distintos, sobrantes
@@ -0,0 +1,74 @@
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Tabla sincronizada -> (tabla resumen, columna de agrupación, columna contador)
+RESUMENES = {
+    'medicos': ('ResumenMedicosDepartamento', 'departamento_id', 'total_medicos'),
+    'consultas': ('ResumenConsultasMedico', 'medico_id', 'total_consultas'),
+}
+
+
+class ResumenUtils:
+
+    @staticmethod
+    def build_updates(
+        table: str,
+        registros: List[Dict[str, Any]],
+        delta: int = 1
+    ) -> List[Tuple[str, tuple]]:
+        """Sentencias que suman (delta=1) o restan (delta=-1) los registros
+        a la tabla resumen.
+
+        Deben ejecutarse en la misma transacción que los INSERT/DELETE de
+        esos registros para que el resumen nunca se desfase.
+        """
+        return ResumenUtils.build_deltas(table, [(r, delta) for r in registros])
+
+    @staticmethod
+    def build_deltas(
+        table: str,
+        movimientos: List[Tuple[Dict[str, Any], int]]
+    ) -> List[Tuple[str, tuple]]:
+        """Como build_updates, pero con un delta por registro.
+
+        Los deltas se netean por grupo en memoria para emitir una sola
+        sentencia por grupo; un grupo cuyo neto es 0 no se toca.
+        """
+        if table not in RESUMENES or not movimientos:
+            return []
+
+        tabla_resumen, columna_grupo, columna_total = RESUMENES[table]
+        conteos = Counter()
+        for registro, delta in movimientos:
+            conteos[registro.get(columna_grupo)] += delta
+
+        query = f"""
+            UPDATE {tabla_resumen} WITH (UPDLOCK, SERIALIZABLE)
+            SET {columna_total} = {columna_total} + ?
+            WHERE {columna_grupo} = ?;
+            IF @@ROWCOUNT = 0
+                INSERT INTO {tabla_resumen} ({columna_grupo}, {columna_total})
+                VALUES (?, ?);
+        """
+        # Orden fijo por clave: dos transacciones que tocan los mismos grupos
+        # toman los bloqueos en el mismo orden y no pueden interbloquearse
+        grupos = sorted(
+            (g, c) for g, c in conteos.items() if g is not None and c != 0)
+
+        statements = [
+            (query, (cantidad, grupo, grupo, cantidad))
+            for grupo, cantidad in grupos
+        ]
+
+        # Un grupo que se queda sin filas deja de aparecer en el resumen
+        statements.extend(
+            (f"DELETE FROM {tabla_resumen} WHERE {columna_grupo} = ? AND {columna_total} <= 0",
+             (grupo,))
+            for grupo, cantidad in grupos
+            if cantidad < 0
+        )
+        return statements
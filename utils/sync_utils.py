@@ -50,6 +50,52 @@ class SyncUtils:
             logger.error(f"❌ Error: {str(e)}")
             return None
     
+    @staticmethod
+    async def fetch_hashes_from_source(
+        table: str,
+        particiones: int,
+        id_desde: Optional[int] = None,
+        id_hasta: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Resumen de hashes por rango de ids calculado por la API Fuente"""
+        params = {"particiones": particiones}
+        if id_desde is not None:
+            params["id_desde"] = id_desde
+        if id_hasta is not None:
+            params["id_hasta"] = id_hasta
+        return await SyncUtils._get_datos_source(f"/api/{table}/hashes", params)
+
+    @staticmethod
+    async def fetch_rango_from_source(table: str, id_desde: int, id_hasta: int) -> Optional[List[Dict[str, Any]]]:
+        """Registros de la API Fuente con id en [id_desde, id_hasta]"""
+        return await SyncUtils._get_datos_source(
+            f"/api/{table}/rango", {"id_desde": id_desde, "id_hasta": id_hasta})
+
+    @staticmethod
+    async def _get_datos_source(path: str, params: Dict[str, Any]) -> Optional[Any]:
+        try:
+            endpoint = f"{API_SOURCE_URL}{path}"
+            logger.info(f"🔗 Conectando a API Fuente: {endpoint} {params}")
+
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.get(endpoint, params=params)
+
+            if response.status_code != 200:
+                logger.error(f"❌ Error HTTP {response.status_code}")
+                return None
+
+            return response.json().get("datos")
+
+        except httpx.TimeoutException:
+            logger.error("❌ Timeout: API Fuente no responde")
+            return None
+        except httpx.ConnectError:
+            logger.error(f"❌ No se pudo conectar a {API_SOURCE_URL}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Error: {str(e)}")
+            return None
+
     @staticmethod
     async def check_id_exists(table: str, id: int) -> bool:
         try: